@@ -0,0 +1,188 @@
+"""Gradient lookup table kernels for Light FX addon.
+
+The scalar kernels are compiled with Numba when it is installed, so they
+only use scalar math that Numba can compile. Without Numba, lookup tables
+are built with the vectorized NumPy equivalents instead.
+"""
+import numpy as np
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs):
+        """Fallback decorator used when Numba is not available."""
+        if args and callable(args[0]):
+            return args[0]
+        return lambda func: func
+
+@njit(cache=True)
+def rgb_to_hsv(r: float, g: float, b: float):
+    """Convert RGB (0-1) to HSV (0-1)."""
+    v = max(r, g, b)
+    delta = v - min(r, g, b)
+    if delta == 0:
+        return 0.0, 0.0, v
+    s = delta / v
+    if v == r:
+        h = ((g - b) / delta) % 6
+    elif v == g:
+        h = (b - r) / delta + 2
+    else:
+        h = (r - g) / delta + 4
+    return h / 6, s, v
+
+@njit(cache=True)
+def hsv_to_rgb(h: float, s: float, v: float):
+    """Convert HSV (0-1) to RGB (0-1) using the six-sector formula."""
+    c = v * s
+    x = c * (1 - abs((h * 6) % 2 - 1))
+    m = v - c
+    sector = int(h * 6) % 6
+    if sector == 0:
+        r, g, b = c, x, 0.0
+    elif sector == 1:
+        r, g, b = x, c, 0.0
+    elif sector == 2:
+        r, g, b = 0.0, c, x
+    elif sector == 3:
+        r, g, b = 0.0, x, c
+    elif sector == 4:
+        r, g, b = x, 0.0, c
+    else:
+        r, g, b = c, 0.0, x
+    return r + m, g + m, b + m
+
+@njit(cache=True)
+def interpolate_hue(h1: float, h2: float, ratio: float) -> float:
+    """Interpolate hue the short way around the color wheel."""
+    diff = h2 - h1
+    if diff > 0.5:
+        h2 -= 1.0
+    elif diff < -0.5:
+        h2 += 1.0
+    h = h1 + (h2 - h1) * ratio
+    if h < 0:
+        h += 1.0
+    elif h > 1:
+        h -= 1.0
+    return h
+
+@njit(cache=True)
+def blend_rgb8(color1: np.ndarray, color2: np.ndarray, ratio: float, out: np.ndarray):
+    """Interpolate two uint8 RGB colors in HSV space and write the result to out."""
+    h1, s1, v1 = rgb_to_hsv(color1[0] / 255, color1[1] / 255, color1[2] / 255)
+    h2, s2, v2 = rgb_to_hsv(color2[0] / 255, color2[1] / 255, color2[2] / 255)
+
+    h = interpolate_hue(h1, h2, ratio)
+    s = s1 + (s2 - s1) * ratio
+    v = v1 + (v2 - v1) * ratio
+
+    r, g, b = hsv_to_rgb(h, s, v)
+    out[0] = int(r * 255 + 0.5)
+    out[1] = int(g * 255 + 0.5)
+    out[2] = int(b * 255 + 0.5)
+
+@njit(cache=True)
+def _build_gradient_lut_jit(positions: np.ndarray, rgb_stops: np.ndarray, out: np.ndarray):
+    """Fill out (N, 3) with the gradient through the sorted stops, one row at a time."""
+    size = out.shape[0]
+    last = len(positions) - 1
+    for i in range(size):
+        position = i * 100 / (size - 1)
+
+        # Outside the range of stops, use the nearest stop
+        if position <= positions[0]:
+            out[i, :] = rgb_stops[0]
+            continue
+        if position >= positions[last]:
+            out[i, :] = rgb_stops[last]
+            continue
+
+        # Find the two stops surrounding the position
+        k = 0
+        while positions[k + 1] < position:
+            k += 1
+        range_size = positions[k + 1] - positions[k]
+        if range_size == 0:
+            out[i, :] = rgb_stops[k]
+        else:
+            ratio = (position - positions[k]) / range_size
+            blend_rgb8(rgb_stops[k], rgb_stops[k + 1], ratio, out[i])
+
+# Order of the (C, X, 0) components that make up R, G and B in each hue sector
+_SECTOR_TABLE = np.array([
+    [0, 1, 2],
+    [1, 0, 2],
+    [2, 0, 1],
+    [2, 1, 0],
+    [1, 2, 0],
+    [0, 2, 1],
+])
+
+def rgb_to_hsv_vec(rgb: np.ndarray):
+    """Convert an (N, 3) array of RGB (0-1) to H, S and V arrays (0-1)."""
+    r, g, b = rgb[:, 0], rgb[:, 1], rgb[:, 2]
+    v = rgb.max(axis=1)
+    delta = v - rgb.min(axis=1)
+    safe_delta = np.where(delta == 0, 1, delta)
+    s = np.where(v == 0, 0, delta / np.where(v == 0, 1, v))
+    h = np.where(v == r, ((g - b) / safe_delta) % 6,
+                 np.where(v == g, (b - r) / safe_delta + 2, (r - g) / safe_delta + 4))
+    h = np.where(delta == 0, 0, h / 6)
+    return h, s, v
+
+def hsv_to_rgb_vec(h: np.ndarray, s: np.ndarray, v: np.ndarray) -> np.ndarray:
+    """Convert H, S and V arrays (0-1) to an (N, 3) array of RGB (0-1)."""
+    c = v * s
+    x = c * (1 - np.abs((h * 6) % 2 - 1))
+    m = v - c
+    sector = np.floor(h * 6).astype(np.int64) % 6
+    components = np.stack((c, x, np.zeros_like(c)), axis=1)
+    return np.take_along_axis(components, _SECTOR_TABLE[sector], axis=1) + m[:, None]
+
+def blend_rgb8_vec(colors1: np.ndarray, colors2: np.ndarray, ratios: np.ndarray) -> np.ndarray:
+    """Interpolate (N, 3) uint8 RGB colors pairwise in HSV space."""
+    h1, s1, v1 = rgb_to_hsv_vec(colors1 / 255)
+    h2, s2, v2 = rgb_to_hsv_vec(colors2 / 255)
+
+    # Interpolate hue the short way around the color wheel
+    diff = h2 - h1
+    h2 = np.where(diff > 0.5, h2 - 1.0, np.where(diff < -0.5, h2 + 1.0, h2))
+    h = h1 + (h2 - h1) * ratios
+    h = np.where(h < 0, h + 1.0, np.where(h > 1, h - 1.0, h))
+    s = s1 + (s2 - s1) * ratios
+    v = v1 + (v2 - v1) * ratios
+
+    return (hsv_to_rgb_vec(h, s, v) * 255 + 0.5).astype(np.uint8)
+
+def _build_gradient_lut_vec(positions: np.ndarray, rgb_stops: np.ndarray, out: np.ndarray):
+    """Fill out (N, 3) with the gradient through the sorted stops, all rows at once."""
+    size = out.shape[0]
+    last = len(positions) - 1
+    position = np.arange(size) * 100 / (size - 1)
+
+    # Find the two stops surrounding each position
+    k = np.clip(np.searchsorted(positions, position) - 1, 0, max(last - 1, 0))
+    k1 = np.minimum(k + 1, last)
+    range_size = positions[k1] - positions[k]
+    ratio = np.clip((position - positions[k]) / np.where(range_size == 0, 1, range_size), 0, 1)
+    out[:] = blend_rgb8_vec(rgb_stops[k], rgb_stops[k1], ratio)
+
+    # Outside the range of stops, use the nearest stop; like the scalar
+    # kernel, the first stop wins where stops share a position
+    out[position >= positions[last]] = rgb_stops[last]
+    out[position <= positions[0]] = rgb_stops[0]
+
+def build_gradient_lut(positions: np.ndarray, rgb_stops: np.ndarray, out: np.ndarray):
+    """Fill out (N, 3) with the gradient through the sorted stops.
+
+    positions holds the stop positions (0-100) in ascending order and
+    rgb_stops the matching uint8 RGB colors.
+    """
+    if NUMBA_AVAILABLE:
+        _build_gradient_lut_jit(positions, rgb_stops, out)
+    else:
+        _build_gradient_lut_vec(positions, rgb_stops, out)
@@ -1,16 +1,43 @@
 #!/usr/bin/env python3
 """Color management system for Light FX addon."""
-from typing import List, Dict, Union, Tuple
+from typing import List, Dict, Union, Tuple, Optional
 from dataclasses import dataclass
-import colorsys
+import bisect
+import hashlib
+import logging
+import os
+import numpy as np
 from colour import Color
 
+from ._lut_build import blend_rgb8_vec, build_gradient_lut
+
+_LOGGER = logging.getLogger(__name__)
+
+LUT_SIZE = 1024
+LUT_CACHE_DIR = "/data/lut_cache"
+LUT_CACHE_VERSION = 1  # bump whenever the LUT build or interpolation changes
+WARM_WHITE_TEMP = 2700
+COLD_WHITE_TEMP = 6500
+COLOR_TEMP_BUCKETS = 8
+
+def _to_rgb8(color: Union[Color, Tuple[int, int, int]]) -> Tuple[int, int, int]:
+    """Convert a Color (or an RGB triple) to a 0-255 integer RGB tuple."""
+    if isinstance(color, Color):
+        return tuple(round(c * 255) for c in color.rgb)
+    return tuple(int(c) for c in color)
+
 @dataclass
 class ColorPoint:
-    """Represents a color point in a palette."""
-    color: Color
+    """Represents a color point in a palette.
+
+    A Color may be passed in; it is stored as a 0-255 integer RGB tuple.
+    """
+    color: Tuple[int, int, int]
     position: float = 0  # 0-100
 
+    def __post_init__(self):
+        self.color = _to_rgb8(self.color)
+
 @dataclass
 class Palette:
     """Represents a color palette."""
@@ -19,11 +46,19 @@ class Palette:
     type: str = "static"  # static, gradient, or dynamic
     parameters: Dict = None
 
+    def __post_init__(self):
+        self._sorted_colors = sorted(self.colors, key=lambda x: x.position)
+        self._positions = [c.position for c in self._sorted_colors]
+
 class ColorManager:
     """Manages color palettes and color conversions."""
     
-    def __init__(self):
+    def __init__(self, cache_dir: Optional[str] = LUT_CACHE_DIR):
         self.palettes = {}
+        self.cache_dir = cache_dir
+        self._luts: Dict[str, np.ndarray] = {}
+        self._rgbw_luts: Dict[str, np.ndarray] = {}
+        self._rgbww_luts: Dict[str, np.ndarray] = {}
         self._init_default_palettes()
 
     def _init_default_palettes(self):
@@ -55,10 +90,82 @@ class ColorManager:
             parameters={"variation": 20}
         )
 
-        self.palettes.update({
-            "rainbow": rainbow,
-            "fire": fire
-        })
+        for palette in (rainbow, fire):
+            self.add_palette(palette)
+
+    def add_palette(self, palette: Palette):
+        """Register a palette and precompute its lookup table."""
+        self.palettes[palette.name] = palette
+        lut = self._build_lut(palette)
+        rgbw, rgbww = self._build_white_luts(lut)
+
+        # The getters return views into the tables shared by all effects
+        for table in (lut, rgbw, rgbww):
+            table.setflags(write=False)
+        self._luts[palette.name] = lut
+        self._rgbw_luts[palette.name] = rgbw
+        self._rgbww_luts[palette.name] = rgbww
+
+    def _build_lut(self, palette: Palette, size: int = LUT_SIZE) -> np.ndarray:
+        """Get the palette LUT from the on-disk cache, building it on a miss."""
+        if not self.cache_dir:
+            return self._compute_lut(palette, size)
+
+        key = hashlib.sha1(
+            repr((LUT_CACHE_VERSION, palette.type, palette.colors, size)).encode()
+        ).hexdigest()
+        path = os.path.join(self.cache_dir, f"{key}.npy")
+        try:
+            lut = np.load(path)
+            if lut.shape == (size, 3) and lut.dtype == np.uint8:
+                return lut
+        except (OSError, ValueError, EOFError):
+            # Missing, truncated or corrupt entries are rebuilt below
+            pass
+
+        lut = self._compute_lut(palette, size)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            with open(tmp_path, "wb") as f:
+                np.save(f, lut)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, path)
+        except OSError as e:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+            _LOGGER.warning(f"Could not cache LUT for palette {palette.name}: {e}")
+        return lut
+
+    def _compute_lut(self, palette: Palette, size: int) -> np.ndarray:
+        """Sample the palette into a table of uint8 RGB rows."""
+        lut = np.empty((size, 3), dtype=np.uint8)
+        if palette.type == "static":
+            for i in range(size):
+                lut[i] = self._color_at_position(palette, i * 100 / (size - 1))
+            return lut
+
+        positions = np.array(palette._positions, dtype=np.float64)
+        rgb_stops = np.array([c.color for c in palette._sorted_colors], dtype=np.uint8)
+        build_gradient_lut(positions, rgb_stops, lut)
+        return lut
+
+    def _build_white_luts(self, lut: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Derive the RGBW and per color temperature bucket RGBWW tables from a LUT."""
+        w = lut.min(axis=1)
+        rgb = lut - w[:, None]
+        rgbw = np.column_stack((rgb, w))
+
+        ratios = np.linspace(0, 1, COLOR_TEMP_BUCKETS)
+        rgbww = np.empty((COLOR_TEMP_BUCKETS, len(lut), 5), dtype=np.uint8)
+        rgbww[:, :, :3] = rgb
+        cw = (w[None, :] * ratios[:, None]).astype(np.uint8)
+        rgbww[:, :, 3] = cw
+        rgbww[:, :, 4] = w[None, :] - cw
+        return rgbw, rgbww
 
     def rgb_to_rgbw(self, rgb: Tuple[int, int, int]) -> Tuple[int, int, int, int]:
         """Convert RGB to RGBW."""
@@ -100,61 +207,75 @@ class ColorManager:
 
         return (r, g, b, cw, ww)
 
-    def get_color_at_position(self, palette_name: str, position: float) -> Color:
-        """Get color at specific position (0-100) in the palette."""
-        palette = self.palettes.get(palette_name)
-        if not palette:
+    def get_lut(self, palette_name: str) -> np.ndarray:
+        """Get the precomputed (LUT_SIZE, 3) uint8 lookup table of a palette."""
+        lut = self._luts.get(palette_name)
+        if lut is None:
+            raise ValueError(f"Palette {palette_name} not found")
+        return lut
+
+    def get_color_at_position(self, palette_name: str, position: float) -> np.ndarray:
+        """Get the uint8 RGB color at specific position (0-100) in the palette."""
+        lut = self.get_lut(palette_name)
+        return lut[self._lut_index(lut, position)]
+
+    def _lut_index(self, lut: np.ndarray, position: float) -> int:
+        """Get the LUT row of a position (0-100), clamped to the ends of the table."""
+        return min(max(int(position * (len(lut) - 1) * 0.01), 0), len(lut) - 1)
+
+    def get_rgbw_at_position(self, palette_name: str, position: float) -> np.ndarray:
+        """Get the uint8 RGBW color at specific position (0-100) in the palette."""
+        lut = self._rgbw_luts.get(palette_name)
+        if lut is None:
+            raise ValueError(f"Palette {palette_name} not found")
+        return lut[self._lut_index(lut, position)]
+
+    def get_rgbww_at_position(self, palette_name: str, position: float,
+                              color_temp: int = COLD_WHITE_TEMP) -> np.ndarray:
+        """Get the uint8 RGBWW color at specific position (0-100) in the palette.
+
+        The color temperature is rounded to one of COLOR_TEMP_BUCKETS steps
+        between warm and cold white.
+        """
+        luts = self._rgbww_luts.get(palette_name)
+        if luts is None:
             raise ValueError(f"Palette {palette_name} not found")
+        temp = min(max(color_temp, WARM_WHITE_TEMP), COLD_WHITE_TEMP)
+        bucket = round((temp - WARM_WHITE_TEMP) / (COLD_WHITE_TEMP - WARM_WHITE_TEMP)
+                       * (COLOR_TEMP_BUCKETS - 1))
+        lut = luts[bucket]
+        return lut[self._lut_index(lut, position)]
+
+    def _color_at_position(self, palette: Palette, position: float) -> Tuple[int, int, int]:
+        """Compute the color at a position (0-100) from the palette stops."""
+        colors = palette._sorted_colors
+        i = bisect.bisect_right(palette._positions, position)
 
         if palette.type == "static":
             # For static palettes, just return the nearest color
-            return min(palette.colors, 
-                      key=lambda x: abs(x.position - position)).color
-
-        elif palette.type == "gradient":
-            # Find the two colors to interpolate between
-            colors = sorted(palette.colors, key=lambda x: x.position)
-            
-            # Find the two colors surrounding our position
-            for i in range(len(colors) - 1):
-                if colors[i].position <= position <= colors[i + 1].position:
-                    # Linear interpolation between the two colors
-                    c1 = colors[i]
-                    c2 = colors[i + 1]
-                    range_size = c2.position - c1.position
-                    if range_size == 0:
-                        return c1.color
-                    ratio = (position - c1.position) / range_size
-                    return self._interpolate_color(c1.color, c2.color, ratio)
+            if i == 0:
+                return colors[0].color
+            if i == len(colors) or position - colors[i - 1].position <= colors[i].position - position:
+                return colors[i - 1].color
+            return colors[i].color
 
+        else:
+            # Gradient and dynamic palettes blend between stops
             # If we're outside the range, return the nearest color
-            return colors[-1].color if position > colors[-1].position else colors[0].color
+            if i == 0:
+                return colors[0].color
+            if i == len(colors):
+                return colors[-1].color
 
-    def _interpolate_color(self, color1: Color, color2: Color, ratio: float) -> Color:
-        """Interpolate between two colors using HSV color space."""
-        # Convert to HSV for better interpolation
-        hsv1 = colorsys.rgb_to_hsv(*color1.rgb)
-        hsv2 = colorsys.rgb_to_hsv(*color2.rgb)
-        
-        # Interpolate in HSV space
-        h = self._interpolate_hue(hsv1[0], hsv2[0], ratio)
-        s = hsv1[1] + (hsv2[1] - hsv1[1]) * ratio
-        v = hsv1[2] + (hsv2[2] - hsv1[2]) * ratio
-        
-        # Convert back to RGB
-        rgb = colorsys.hsv_to_rgb(h, s, v)
-        return Color(rgb=rgb)
-
-    def _interpolate_hue(self, h1: float, h2: float, ratio: float) -> float:
-        """Interpolate hue the short way around the color wheel."""
-        diff = h2 - h1
-        if diff > 0.5:
-            h2 -= 1.0
-        elif diff < -0.5:
-            h2 += 1.0
-        h = h1 + (h2 - h1) * ratio
-        if h < 0:
-            h += 1.0
-        elif h > 1:
-            h -= 1.0
-        return h
+            # Linear interpolation between the two colors surrounding our position
+            c1 = colors[i - 1]
+            c2 = colors[i]
+            ratio = (position - c1.position) / (c2.position - c1.position)
+            return self._interpolate_color(c1.color, c2.color, ratio)
+
+    def _interpolate_color(self, color1: np.ndarray, color2: np.ndarray,
+                           ratio: float) -> np.ndarray:
+        """Interpolate between two uint8 RGB colors using HSV color space."""
+        return blend_rgb8_vec(np.asarray(color1, dtype=np.uint8)[None, :],
+                              np.asarray(color2, dtype=np.uint8)[None, :],
+                              np.array([ratio]))[0]
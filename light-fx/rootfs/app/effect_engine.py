@@ -3,9 +3,8 @@ from typing import List, Dict, Any, Optional, Callable
 import asyncio
 import time
 import math
-import random
 from dataclasses import dataclass
-from colour import Color
+import numpy as np
 
 from .color_manager import ColorManager, Palette
 from .light_manager import LightManager, LightSequence
@@ -19,125 +18,130 @@ class EffectConfig:
     reverse: bool = False
     mirror: bool = False
 
+    def __post_init__(self):
+        # Constants used by every frame of an effect run
+        self._speed_factor = self.speed / 50.0  # normalize to 1 at speed 50
+        self._intensity_lut = np.clip(
+            np.arange(256) * self.intensity // 100, 0, 255
+        ).astype(np.uint8)
+
 class Effect:
     """Base class for all effects."""
     
     def __init__(self, color_manager: ColorManager):
         self.color_manager = color_manager
         self._frame = 0
-        self._start_time = time.time()
+        self._start_time = time.monotonic()
+        self._light_positions: Dict[int, np.ndarray] = {}  # id(sequence): positions
+
+    def _get_light_positions(self, sequence: LightSequence) -> np.ndarray:
+        """Get the evenly spaced palette position (0-100) of each light in a sequence."""
+        positions = self._light_positions.get(id(sequence))
+        if positions is None or len(positions) != len(sequence.light_ids):
+            num_lights = len(sequence.light_ids)
+            positions = np.arange(num_lights) * (100.0 / max(num_lights, 1))
+            self._light_positions[id(sequence)] = positions
+        return positions
+
+    def _mirror(self, rgb: np.ndarray, num_lights: int) -> np.ndarray:
+        """Expand colors computed for the first half of a sequence to all its lights."""
+        return np.concatenate((rgb, rgb[:num_lights // 2][::-1]))
 
-    async def generate_frame(self, sequence: LightSequence, config: EffectConfig) -> Dict[str, Dict]:
-        """Generate the next frame of the effect."""
+    async def generate_frame(self, sequence: LightSequence, config: EffectConfig) -> np.ndarray:
+        """Generate the next frame of the effect.
+
+        Returns a (num_lights, 3) uint8 array with the RGB color of each light
+        in sequence.light_ids.
+        """
         raise NotImplementedError()
 
 class RainbowEffect(Effect):
     """Rainbow wave effect."""
     
-    async def generate_frame(self, sequence: LightSequence, config: EffectConfig) -> Dict[str, Dict]:
+    async def generate_frame(self, sequence: LightSequence, config: EffectConfig) -> np.ndarray:
         num_lights = len(sequence.light_ids)
-        speed_factor = config.speed / 50  # normalize to 1 at speed 50
         
         # Calculate base offset based on time
-        time_offset = (time.time() - self._start_time) * speed_factor
+        time_offset = (time.monotonic() - self._start_time) * config._speed_factor
         
-        updates = {}
-        for i, light_id in enumerate(sequence.light_ids):
-            # Calculate position in rainbow (0-100)
-            pos = ((i / num_lights) * 100 + time_offset * 20) % 100
-            if config.reverse:
-                pos = 100 - pos
-                
-            color = self.color_manager.get_color_at_position("rainbow", pos)
-            
-            # Apply intensity
-            rgb = [int(c * config.intensity / 100) for c in [color.red * 255, color.green * 255, color.blue * 255]]
-            
-            updates[light_id] = {"rgb_color": rgb}
-            
-            # Handle mirroring
-            if config.mirror and i >= num_lights // 2:
-                mirror_i = num_lights - 1 - i
-                updates[sequence.light_ids[mirror_i]] = updates[light_id]
-        
-        return updates
+        # Calculate position in rainbow (0-100) for every light at once,
+        # only the first half of the lights when mirroring
+        positions = self._get_light_positions(sequence)
+        if config.mirror:
+            positions = positions[:(num_lights + 1) // 2]
+        pos = (positions + time_offset * 20) % 100
+        if config.reverse:
+            pos = 100 - pos
+
+        lut = self.color_manager.get_lut("rainbow")
+        rgb = lut[(pos * ((len(lut) - 1) * 0.01)).astype(np.int32)]
+
+        # Apply intensity
+        rgb = config._intensity_lut[rgb]
+
+        # Handle mirroring
+        if config.mirror:
+            rgb = self._mirror(rgb, num_lights)
+
+        return rgb
 
 class ColorWipeEffect(Effect):
     """Color wipe effect."""
     
-    async def generate_frame(self, sequence: LightSequence, config: EffectConfig) -> Dict[str, Dict]:
+    async def generate_frame(self, sequence: LightSequence, config: EffectConfig) -> np.ndarray:
         num_lights = len(sequence.light_ids)
-        speed_factor = config.speed / 50
         
+        # When mirroring, wipe the first half and copy it onto the second
+        wipe_lights = (num_lights + 1) // 2 if config.mirror else num_lights
+
         # Calculate which lights should be on based on time
-        time_offset = (time.time() - self._start_time) * speed_factor
-        active_lights = int((time_offset * 2) % (num_lights + 1))
+        time_offset = (time.monotonic() - self._start_time) * config._speed_factor
+        active_lights = int((time_offset * 2) % (wipe_lights + 1))
         
-        updates = {}
-        palette = self.color_manager.palettes[config.palette_name]
-        
-        for i, light_id in enumerate(sequence.light_ids):
-            if config.reverse:
-                i = num_lights - 1 - i
-                
-            if i < active_lights:
-                color = self.color_manager.get_color_at_position(
-                    config.palette_name,
-                    (i / num_lights) * 100
-                )
-                rgb = [int(c * config.intensity / 100) for c in [color.red * 255, color.green * 255, color.blue * 255]]
-                updates[light_id] = {"rgb_color": rgb}
-            else:
-                updates[light_id] = {"rgb_color": [0, 0, 0]}
+        # Step of each light in the wipe and its palette position (0-100)
+        steps = np.arange(wipe_lights)
+        if config.reverse:
+            steps = steps[::-1]
+        pos = steps * (100.0 / max(wipe_lights, 1))
+
+        lut = self.color_manager.get_lut(config.palette_name)
+        rgb = config._intensity_lut[lut[(pos * ((len(lut) - 1) * 0.01)).astype(np.int32)]]
+        rgb[steps >= active_lights] = 0
         
-        return updates
+        if config.mirror:
+            rgb = self._mirror(rgb, num_lights)
+
+        return rgb
 
 class TwinkleEffect(Effect):
     """Twinkle effect."""
     
     def __init__(self, color_manager: ColorManager):
         super().__init__(color_manager)
-        self._twinkle_states = {}
+        self._twinkle_states: Dict[int, np.ndarray] = {}  # id(sequence): fade levels
         
-    async def generate_frame(self, sequence: LightSequence, config: EffectConfig) -> Dict[str, Dict]:
-        updates = {}
-        speed_factor = config.speed / 50
+    async def generate_frame(self, sequence: LightSequence, config: EffectConfig) -> np.ndarray:
+        num_lights = len(sequence.light_ids)
+        speed_factor = config._speed_factor
         
         # Initialize twinkle states if needed
-        for light_id in sequence.light_ids:
-            if light_id not in self._twinkle_states:
-                self._twinkle_states[light_id] = 0
-        
-        # Update twinkle states
-        for light_id in sequence.light_ids:
-            if self._twinkle_states[light_id] == 0:
-                # Start new twinkle?
-                if random.random() < 0.1 * speed_factor:
-                    self._twinkle_states[light_id] = 1
-                    color = self.color_manager.get_color_at_position(
-                        config.palette_name,
-                        random.uniform(0, 100)
-                    )
-                    rgb = [int(c * config.intensity / 100) for c in [color.red * 255, color.green * 255, color.blue * 255]]
-                    updates[light_id] = {"rgb_color": rgb}
-                else:
-                    updates[light_id] = {"rgb_color": [0, 0, 0]}
-            else:
-                # Fade existing twinkle
-                self._twinkle_states[light_id] -= 0.1 * speed_factor
-                if self._twinkle_states[light_id] <= 0:
-                    self._twinkle_states[light_id] = 0
-                    updates[light_id] = {"rgb_color": [0, 0, 0]}
-                else:
-                    color = self.color_manager.get_color_at_position(
-                        config.palette_name,
-                        random.uniform(0, 100)
-                    )
-                    intensity = self._twinkle_states[light_id] * config.intensity / 100
-                    rgb = [int(c * intensity) for c in [color.red * 255, color.green * 255, color.blue * 255]]
-                    updates[light_id] = {"rgb_color": rgb}
+        states = self._twinkle_states.get(id(sequence))
+        if states is None or len(states) != num_lights:
+            states = np.zeros(num_lights, dtype=np.float32)
+            self._twinkle_states[id(sequence)] = states
         
-        return updates
+        # Start new twinkles on dark lights and fade existing ones
+        ignite = (states == 0) & (np.random.random(num_lights) < 0.1 * speed_factor)
+        states[~ignite] -= 0.1 * speed_factor
+        states[ignite] = 1.0
+        states.clip(0, out=states)
+
+        # Pick a random palette color for every light and scale it by its
+        # fade level, as a fixed point fraction of 256
+        lut = self.color_manager.get_lut(config.palette_name)
+        rgb = config._intensity_lut[lut[np.random.randint(len(lut), size=num_lights)]]
+        level = (states * 256).astype(np.uint16)
+        return ((rgb.astype(np.uint16) * level[:, None]) >> 8).astype(np.uint8)
 
 class EffectEngine:
     """Manages and runs effects on light sequences."""
@@ -186,16 +190,22 @@ class EffectEngine:
     async def _run_effect(self, sequence: LightSequence, effect: Effect, config: EffectConfig):
         """Run an effect continuously."""
         try:
+            target = time.monotonic()
             while True:
                 # Generate and apply the next frame
-                updates = await effect.generate_frame(sequence, config)
+                frame = await effect.generate_frame(sequence, config)
                 
-                # Apply updates to all lights
-                for entity_id, params in updates.items():
-                    await self.light_manager.update_light(entity_id, **params)
+                await self.light_manager.apply_frame(sequence, frame)
                 
-                # Wait for next frame
-                await asyncio.sleep(self._frame_delay)
+                effect._frame += 1
+
+                # Wait for next frame, dropping frames if the updates fell behind
+                target += self._frame_delay
+                now = time.monotonic()
+                if now > target + self._frame_delay:
+                    effect._frame += int((now - target) / self._frame_delay)
+                    target = now
+                await asyncio.sleep(target - now)
                 
         except asyncio.CancelledError:
             # Clean up if needed
@@ -1,7 +1,8 @@
 """Home Assistant API integration for Light FX addon."""
+import asyncio
 import logging
 import json
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Callable
 
 import aiohttp
 
@@ -22,31 +23,45 @@ class HomeAssistantAPI:
         }
         self.websocket = None
         self.id_counter = 0
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._event_callbacks: Dict[int, Callable] = {}  # subscription id: callback
+        self._pending_results: Dict[int, asyncio.Future] = {}  # message id: result
+        self._listener: Optional[asyncio.Task] = None
+
+    async def _ensure_session(self) -> aiohttp.ClientSession:
+        """Get the shared HTTP session, creating it on first use."""
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                headers=self.headers,
+                connector=aiohttp.TCPConnector(limit=32, keepalive_timeout=60)
+            )
+        return self._session
 
     async def get_state(self, entity_id: str) -> Dict[str, Any]:
         """Get the state of an entity."""
         url = f"{self.base_url}/states/{entity_id}"
-        async with aiohttp.ClientSession(headers=self.headers) as session:
-            async with session.get(url) as response:
-                if response.status == 200:
-                    return await response.json()
-                else:
-                    text = await response.text()
-                    raise Exception(f"Failed to get state: {text}")
+        session = await self._ensure_session()
+        async with session.get(url) as response:
+            if response.status == 200:
+                return await response.json()
+            else:
+                text = await response.text()
+                raise Exception(f"Failed to get state: {text}")
 
     async def call_service(self, domain: str, service: str, data: Dict[str, Any]):
         """Call a Home Assistant service."""
         url = f"{self.base_url}/services/{domain}/{service}"
-        async with aiohttp.ClientSession(headers=self.headers) as session:
-            async with session.post(url, json=data) as response:
-                if response.status != 200:
-                    text = await response.text()
-                    raise Exception(f"Failed to call service: {text}")
+        session = await self._ensure_session()
+        async with session.post(url, json=data) as response:
+            if response.status != 200:
+                text = await response.text()
+                raise Exception(f"Failed to call service: {text}")
 
     async def connect_websocket(self):
         """Connect to Home Assistant websocket API."""
         url = f"ws://{self.host}:{self.port}/api/websocket"
-        self.websocket = await aiohttp.ClientSession().ws_connect(url)
+        session = await self._ensure_session()
+        self.websocket = await session.ws_connect(url)
         
         # Send auth message
         auth_msg = {
@@ -61,31 +76,79 @@ class HomeAssistantAPI:
             raise Exception("Authentication failed")
 
     async def subscribe_to_events(self, event_type: str, callback):
-        """Subscribe to Home Assistant events."""
+        """Subscribe to Home Assistant events.
+
+        Events of all subscriptions are dispatched to their callbacks by a
+        single listener task reading the websocket.
+        """
         if not self.websocket:
             await self.connect_websocket()
+        if not self._listener:
+            self._listener = asyncio.create_task(self._listen())
+        elif self._listener.done():
+            # Nothing would resolve the subscription result
+            raise Exception("Websocket listener has stopped")
             
         self.id_counter += 1
+        msg_id = self.id_counter
+        result = asyncio.get_running_loop().create_future()
+        self._pending_results[msg_id] = result
+        self._event_callbacks[msg_id] = callback
         sub_msg = {
-            "id": self.id_counter,
+            "id": msg_id,
             "type": "subscribe_events",
             "event_type": event_type
         }
         await self.websocket.send_json(sub_msg)
         
         # Handle the subscription confirmation
-        msg = await self.websocket.receive_json()
-        if msg["type"] != "result" or not msg.get("success"):
+        msg = await result
+        if not msg.get("success"):
+            del self._event_callbacks[msg_id]
             raise Exception("Failed to subscribe to events")
 
-        # Start listening for events
-        while True:
-            msg = await self.websocket.receive_json()
-            if msg["type"] == "event":
-                await callback(msg["event"])
+    async def _listen(self):
+        """Dispatch websocket messages to subscription results and callbacks."""
+        try:
+            while True:
+                msg = await self.websocket.receive_json()
+                if msg["type"] == "result":
+                    result = self._pending_results.pop(msg["id"], None)
+                    if result and not result.done():
+                        result.set_result(msg)
+                elif msg["type"] == "event":
+                    callback = self._event_callbacks.get(msg["id"])
+                    if callback:
+                        try:
+                            await callback(msg["event"])
+                        except Exception as e:
+                            _LOGGER.error(f"Error handling event {msg['event'].get('event_type')}: {e}")
+        except Exception as e:
+            _LOGGER.error(f"Websocket listener stopped: {e}")
+            for result in self._pending_results.values():
+                if not result.done():
+                    result.set_exception(e)
+            self._pending_results.clear()
+            raise
+
+    async def wait_closed(self):
+        """Wait until the websocket listener stops, raising its error if it failed."""
+        if self._listener:
+            await self._listener
 
     async def close(self):
-        """Close the websocket connection."""
+        """Close the websocket connection and the shared HTTP session."""
+        if self._listener:
+            self._listener.cancel()
+            try:
+                await self._listener
+            except (asyncio.CancelledError, Exception):
+                # A listener that failed has already logged its error
+                pass
+            self._listener = None
         if self.websocket:
             await self.websocket.close()
             self.websocket = None
+        if self._session:
+            await self._session.close()
+            self._session = None
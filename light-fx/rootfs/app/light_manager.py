@@ -3,6 +3,7 @@ from typing import List, Dict, Any, Optional
 import logging
 import asyncio
 from dataclasses import dataclass
+import numpy as np
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -29,13 +30,25 @@ class LightState:
     rgbww_color: Optional[tuple] = None
     color_temp: Optional[int] = None
 
+# State attributes and the LightManager arrays that store them, one row per light
+_STATE_COLUMNS = {
+    'brightness': '_brightness',
+    'rgb_color': '_rgb',
+    'rgbw_color': '_rgbw',
+    'rgbww_color': '_rgbww',
+    'color_temp': '_color_temp',
+}
+# Column of each state attribute in LightManager._known
+_KNOWN_COLUMN = {name: i for i, name in enumerate(_STATE_COLUMNS)}
+
 class LightSequence:
     """Represents an ordered sequence of lights."""
     def __init__(self, name: str, lights: List[str]):
         self.name = name
         self.light_ids = lights
-        self.states: Dict[str, LightState] = {}
         self.capabilities: Dict[str, LightCapabilities] = {}
+        # Row of each light in the LightManager state arrays
+        self._indices = np.empty(0, dtype=np.intp)
 
 class LightManager:
     """Manages light entities and their states."""
@@ -43,19 +56,73 @@ class LightManager:
     def __init__(self, ha_api):
         self.ha_api = ha_api
         self.sequences: Dict[str, LightSequence] = {}
-        self.light_states: Dict[str, LightState] = {}
-        self._update_lock = asyncio.Lock()
+        self._state_lock = asyncio.Lock()  # guards the state arrays, not HA calls
+
+        # Light states are stored column-wise, indexed by _id_to_idx
+        self._id_to_idx: Dict[str, int] = {}
+        self._state_on = np.zeros(0, dtype=bool)
+        self._brightness = np.zeros(0, dtype=np.uint8)
+        self._rgb = np.zeros((0, 3), dtype=np.uint8)
+        self._rgbw = np.zeros((0, 4), dtype=np.uint8)
+        self._rgbww = np.zeros((0, 5), dtype=np.uint8)
+        self._color_temp = np.zeros(0, dtype=np.int32)
+        # Whether each attribute has ever been reported or written
+        self._known = np.zeros((0, len(_STATE_COLUMNS)), dtype=bool)
 
     async def create_sequence(self, name: str, light_ids: List[str]) -> LightSequence:
         """Create a new light sequence."""
         sequence = LightSequence(name, light_ids)
+        sequence._indices = np.array(
+            [self._register_light(entity_id) for entity_id in light_ids], dtype=np.intp
+        )
         # Fetch initial states and capabilities
         for entity_id in light_ids:
             await self._fetch_capabilities(entity_id, sequence)
-            await self._fetch_state(entity_id, sequence)
+            await self._fetch_state(entity_id)
         self.sequences[name] = sequence
         return sequence
 
+    def _register_light(self, entity_id: str) -> int:
+        """Get the state array row of a light, allocating one if needed."""
+        idx = self._id_to_idx.get(entity_id)
+        if idx is not None:
+            return idx
+
+        idx = len(self._id_to_idx)
+        if idx >= len(self._state_on):
+            # Grow all state arrays, doubling their capacity
+            capacity = max(8, 2 * len(self._state_on))
+            for column in ('_state_on', '_known', *_STATE_COLUMNS.values()):
+                old = getattr(self, column)
+                new = np.zeros((capacity,) + old.shape[1:], dtype=old.dtype)
+                new[:len(old)] = old
+                setattr(self, column, new)
+        self._id_to_idx[entity_id] = idx
+        return idx
+
+    def get_light_state(self, entity_id: str) -> Optional[LightState]:
+        """Get a snapshot of the stored state of a light."""
+        idx = self._id_to_idx.get(entity_id)
+        if idx is None:
+            return None
+        known = self._known[idx]
+
+        def value(name):
+            if not known[_KNOWN_COLUMN[name]]:
+                return None
+            column = getattr(self, _STATE_COLUMNS[name])[idx]
+            return tuple(column.tolist()) if column.ndim else int(column)
+
+        return LightState(
+            entity_id=entity_id,
+            state='on' if self._state_on[idx] else 'off',
+            brightness=value('brightness'),
+            rgb_color=value('rgb_color'),
+            rgbw_color=value('rgbw_color'),
+            rgbww_color=value('rgbww_color'),
+            color_temp=value('color_temp')
+        )
+
     async def _fetch_capabilities(self, entity_id: str, sequence: LightSequence):
         """Fetch capabilities of a light entity."""
         try:
@@ -79,47 +146,89 @@ class LightManager:
             _LOGGER.error(f"Error fetching capabilities for {entity_id}: {e}")
             raise
 
-    async def _fetch_state(self, entity_id: str, sequence: LightSequence):
+    async def _fetch_state(self, entity_id: str):
         """Fetch current state of a light entity."""
         try:
             state = await self.ha_api.get_state(entity_id)
-            attributes = state.get('attributes', {})
-            
-            light_state = LightState(
-                entity_id=entity_id,
-                state=state.get('state'),
-                brightness=attributes.get('brightness'),
-                rgb_color=tuple(attributes['rgb_color']) if 'rgb_color' in attributes else None,
-                rgbw_color=tuple(attributes['rgbw_color']) if 'rgbw_color' in attributes else None,
-                rgbww_color=tuple(attributes['rgbww_color']) if 'rgbww_color' in attributes else None,
-                color_temp=attributes.get('color_temp')
-            )
-            
-            sequence.states[entity_id] = light_state
-            self.light_states[entity_id] = light_state
+            self._store_state(self._id_to_idx[entity_id], state)
             
         except Exception as e:
             _LOGGER.error(f"Error fetching state for {entity_id}: {e}")
             raise
 
+    def _store_state(self, idx: int, state: Dict[str, Any]):
+        """Store a Home Assistant state object in row idx of the state arrays."""
+        attributes = state.get('attributes', {})
+        self._state_on[idx] = state.get('state') == 'on'
+        for name, column in _STATE_COLUMNS.items():
+            # Attributes are null while a light is off, keep the last known value
+            value = attributes.get(name)
+            if value is not None:
+                getattr(self, column)[idx] = value
+                self._known[idx, _KNOWN_COLUMN[name]] = True
+
+    async def handle_state_changed(self, event: Dict[str, Any]):
+        """Refresh the stored state of a managed light from a state_changed event."""
+        data = event.get('data', {})
+        idx = self._id_to_idx.get(data.get('entity_id'))
+        new_state = data.get('new_state')
+        if idx is None or not new_state:
+            return
+
+        async with self._state_lock:
+            self._store_state(idx, new_state)
+
     async def update_light(self, entity_id: str, **kwargs):
         """Update a light entity's state."""
-        async with self._update_lock:
-            try:
-                await self.ha_api.call_service(
-                    'light', 'turn_on',
-                    {'entity_id': entity_id, **kwargs}
-                )
-                # Wait a bit for the state to update
-                await asyncio.sleep(0.1)
-                # Update our stored state
-                for sequence in self.sequences.values():
-                    if entity_id in sequence.light_ids:
-                        await self._fetch_state(entity_id, sequence)
-                        
-            except Exception as e:
-                _LOGGER.error(f"Error updating light {entity_id}: {e}")
-                raise
+        await self.update_lights([entity_id], **kwargs)
+
+    async def update_lights(self, entity_ids: List[str], **kwargs):
+        """Apply the same state to several light entities in one service call."""
+        await self._turn_on(entity_ids, **kwargs)
+
+        # The write is authoritative, record it without reading back
+        idx = [self._id_to_idx[entity_id] for entity_id in entity_ids
+               if entity_id in self._id_to_idx]
+        async with self._state_lock:
+            self._state_on[idx] = True
+            for name, value in kwargs.items():
+                column = _STATE_COLUMNS.get(name)
+                if column:
+                    getattr(self, column)[idx] = value
+                    self._known[idx, _KNOWN_COLUMN[name]] = True
+
+    async def apply_frame(self, sequence: LightSequence, frame: np.ndarray):
+        """Set the lights of a sequence to a (num_lights, 3) uint8 RGB frame.
+
+        Lights sharing a color are updated with one service call, and the
+        frame is recorded with a single store into the state arrays.
+        """
+        colors, color_idx = np.unique(frame, axis=0, return_inverse=True)
+        groups: List[List[str]] = [[] for _ in range(len(colors))]
+        for entity_id, group in zip(sequence.light_ids, color_idx.reshape(-1).tolist()):
+            groups[group].append(entity_id)
+
+        await asyncio.gather(*(
+            self._turn_on(entity_ids, rgb_color=color)
+            for entity_ids, color in zip(groups, colors.tolist())
+        ))
+
+        # The write is authoritative, record it without reading back
+        async with self._state_lock:
+            self._state_on[sequence._indices] = True
+            self._rgb[sequence._indices] = frame
+            self._known[sequence._indices, _KNOWN_COLUMN['rgb_color']] = True
+
+    async def _turn_on(self, entity_ids: List[str], **kwargs):
+        """Call light.turn_on for several light entities."""
+        try:
+            await self.ha_api.call_service(
+                'light', 'turn_on',
+                {'entity_id': entity_ids, **kwargs}
+            )
+        except Exception as e:
+            _LOGGER.error(f"Error updating lights {', '.join(entity_ids)}: {e}")
+            raise
 
     async def turn_off_sequence(self, sequence_name: str):
         """Turn off all lights in a sequence."""
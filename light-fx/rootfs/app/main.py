@@ -3,6 +3,7 @@ import asyncio
 import logging
 import json
 import os
+import signal
 from typing import Dict, Any
 
 from .ha_api import HomeAssistantAPI
@@ -79,6 +80,12 @@ class LightFX:
             
     async def run(self):
         """Run the application."""
+        # Shut down on SIGTERM/SIGINT, also while setup is still running
+        loop = asyncio.get_running_loop()
+        task = asyncio.current_task()
+        for sig in (signal.SIGTERM, signal.SIGINT):
+            loop.add_signal_handler(sig, task.cancel)
+
         try:
             await self.setup()
             
@@ -104,25 +111,35 @@ class LightFX:
                 }
             }
             
-            # Start event subscription
+            # Start event subscriptions
+            await self.ha_api.subscribe_to_events(
+                'state_changed',
+                self.light_manager.handle_state_changed
+            )
             await self.ha_api.subscribe_to_events(
                 'light_fx_service_call',
                 self.handle_service_call
             )
             
-            # Keep the application running
-            while True:
-                await asyncio.sleep(1)
+            # Run until the event listener stops or we are asked to shut down
+            await self.ha_api.wait_closed()
                 
+        except asyncio.CancelledError:
+            _LOGGER.info("Shutting down")
+            
         except Exception as e:
             _LOGGER.error(f"Application error: {e}")
             raise
             
         finally:
-            # Cleanup
-            for sequence_name in list(self.effect_engine._running_effects.keys()):
-                await self.effect_engine.stop_effect(sequence_name)
-            await self.ha_api.close()
+            # Cleanup, shielded from further cancellation
+            await asyncio.shield(self.shutdown())
+
+    async def shutdown(self):
+        """Stop all running effects and close the Home Assistant connection."""
+        for sequence_name in list(self.effect_engine._running_effects.keys()):
+            await self.effect_engine.stop_effect(sequence_name)
+        await self.ha_api.close()
 
 def main():
     """Main entry point."""